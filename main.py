@@ -1,23 +1,41 @@
 #!/usr/bin/env python3
 import os
+import re
 import sys
+import asyncio
 import subprocess
 import datetime
+import gzip
 import json
+import mmap
+import time
 from pathlib import Path
 import shutil
+import sqlite3
+import tarfile
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from functools import lru_cache, wraps
+
+@lru_cache(maxsize=1)
+def is_docker_running():
+    # "docker info" spricht mit dem Daemon, daher nur einmal pro Sitzung
+    try:
+        return subprocess.run(["docker", "info"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              timeout=5).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
 
 # Prüfe, ob Docker installiert ist und läuft
 def check_docker():
     try:
-        result = subprocess.run(["docker", "info"], capture_output=True, text=True, timeout=5)
-        if result.returncode != 0:
+        if shutil.which("docker") is None:
+            print("Fehler: Docker ist nicht installiert. Bitte installiere Docker.")
+            sys.exit(1)
+        if not is_docker_running():
             print("Fehler: Docker ist nicht gestartet oder nicht korrekt installiert.")
             sys.exit(1)
-    except FileNotFoundError:
-        print("Fehler: Docker ist nicht installiert. Bitte installiere Docker.")
-        sys.exit(1)
     except Exception as e:
         print(f"Fehler beim Prüfen von Docker: {e}")
         sys.exit(1)
@@ -38,15 +56,59 @@ except ImportError:
     print("\nWeitere Infos: https://github.com/kazhala/InquirerPy")
     sys.exit(1)
 
+# orjson ist optional und deutlich schneller als das json-Modul der Standardbibliothek
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# isal (python-isal) ist optional und entpackt gzip per SIMD deutlich schneller als zlib
+try:
+    from isal import igzip
+except ImportError:
+    igzip = None
+
 CONFIG_FILE = os.path.expanduser("~/.docker_backup_tool_config.json")
+# SQLite-Index aller Backups, damit die Menüs nicht bei jedem Aufruf den Backup-Ordner durchsuchen
+INDEX_FILE = os.path.expanduser("~/.docker_backup_tool/index.db")
+INDEX_LIMIT = 500
+# Voll-Backup: <JJJJ-MM-TT>_<HH-MM-SS>_<Container>.tar[.gz] -> Container
+BACKUP_FN_RE = re.compile(r"^[^_]+_[^_]+_(.+?)\.tar(?:\.gz)?$")
+# Im Speicher gehaltene Konfiguration und zuletzt geschriebener Dateiinhalt
+CONFIG_CACHE = None
+CONFIG_WRITTEN = None
+# Maximale Anzahl gleichzeitig laufender Docker-Prozesse (z.B. Volume-Sicherungen)
+MAX_ASYNC = 8
+# Puffergröße für Pipes und Archivdateien (1 MiB statt der üblichen 4-64 KiB)
+PIPE_BUFSIZE = 1 << 20
+# Kopierpuffer für Archiv-Member (tarfile nutzt sonst 16 KiB)
+COPY_BUFSIZE = 2 << 20
+# Volumes beim Wiederherstellen nacheinander statt parallel entpacken (Kommandozeile: --serial-restore)
+SERIAL_RESTORE = False
+# Keine "[Enter]"-Pausen, z.B. für Skripte (Kommandozeile: --non-interactive, oder Umgebungsvariable DBT_NO_PAUSE)
+NON_INTERACTIVE = False
+# Image für die Hilfscontainer, die Volumes sichern und wiederherstellen
+HELPER_IMAGE = "alpine"
+# Image-Label mit dem originalen Containernamen (Registry-Referenzen erlauben nur Kleinbuchstaben)
+CONTAINER_LABEL = "docker-backuptool.container"
+# Zwischenspeicher für "docker inspect": Containername -> (Zeitpunkt, Daten)
+INSPECT_CACHE = {}
 
+def pause(message="[Enter] für Hauptmenü..."):
+    # Wartet nur, wenn jemand davor sitzt: ohne Terminal auf stdin würde input() hängen bleiben oder abbrechen
+    if NON_INTERACTIVE or os.environ.get("DBT_NO_PAUSE") or not sys.stdin.isatty():
+        return
+    input(message)
+
+@lru_cache(maxsize=1)
 def is_git_installed():
-    return subprocess.run(["git", "--version"], capture_output=True).returncode == 0
+    # Reine PATH-Suche statt "git --version", einmal pro Sitzung
+    return shutil.which("git") is not None
 
 def git_config_menu(config):
     if not is_git_installed():
         print("Git ist nicht installiert. Bitte installiere Git, um diese Funktion zu nutzen.")
-        input("[Enter] für Zurück...")
+        pause("[Enter] für Zurück...")
         return
     repo_url = inquirer.text(message="Git-Repository-URL angeben (z.B. https://github.com/user/repo.git):").execute()
     username = inquirer.text(message="Git-Benutzername (optional):").execute()
@@ -65,7 +127,7 @@ def git_config_menu(config):
         test_result = subprocess.run(["git", "ls-remote", repo_url_with_token], capture_output=True)
         if test_result.returncode != 0:
             print("Fehler: Token ungültig oder keine Berechtigung für das Repo!")
-            input("[Enter] für Zurück...")
+            pause("[Enter] für Zurück...")
             return
         else:
             print("Token erfolgreich geprüft.")
@@ -75,14 +137,54 @@ def git_config_menu(config):
     config["git_token"] = token
     save_config(config)
     print("Git-Konfiguration gespeichert.")
-    input("[Enter] für Zurück...")
+    pause("[Enter] für Zurück...")
     return  # Nach Abschluss ins Hauptmenü
 
-def git_commit_and_push(backup_path, config, repo_idx, files_to_add=None):
-    repos = config.get("git_repos", [])
-    if not is_git_installed() or not repos or repo_idx >= len(repos):
-        return
-    repo = repos[repo_idx]
+async def run_git(backup_path, *args, quiet=False, input=None):
+    # Startet einen git-Befehl asynchron, damit unabhängige Schritte überlappen können
+    output = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL} if quiet else {}
+    if input is not None:
+        output["stdin"] = subprocess.PIPE
+    proc = await asyncio.create_subprocess_exec("git", *args, cwd=backup_path, **output)
+    await proc.communicate(input)
+    return proc.returncode
+
+# git liest die Pfade NUL-getrennt von stdin: keine ARG_MAX-Grenze und kein Durchlauf des ganzen Arbeitsverzeichnisses
+GIT_ADD_FROM_STDIN = ["add", "--pathspec-from-file=-", "--pathspec-file-nul"]
+
+def pathspec_input(files):
+    return b"\0".join(os.fsencode(f) for f in files)
+
+def list_changed_files(backup_path):
+    # Geänderte und neue Dateien laut "git status", Umbenennungen liefern zusätzlich den alten Pfad
+    result = subprocess.run(["git", "status", "--porcelain", "-z"], cwd=backup_path, capture_output=True)
+    entries = result.stdout.decode(errors="surrogateescape").split("\0")
+    files = []
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if len(entry) < 4:
+            continue
+        files.append(entry[3:])
+        if entry[0] in "RC":
+            i += 1
+    return files
+
+def git_config_value(value):
+    # Wert in Anführungszeichen gemäß git-config-Syntax
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+def git_on_main(backup_path):
+    # Liest .git/HEAD direkt, statt "git branch -M main" bei jedem Push auszuführen
+    try:
+        with open(os.path.join(backup_path, ".git", "HEAD")) as f:
+            return f.read().strip() == "ref: refs/heads/main"
+    except OSError:
+        return False
+
+async def git_configure_repo(backup_path, repo, fresh=False):
     repo_url = repo["repo_url"]
     # Token in die URL einbauen, falls vorhanden
     if repo.get("git_token") and repo.get("git_user"):
@@ -94,111 +196,369 @@ def git_commit_and_push(backup_path, config, repo_idx, files_to_add=None):
         repo_url_with_token = urlunparse((parsed.scheme, netloc, parsed.path, '', '', ''))
     else:
         repo_url_with_token = repo_url
-    # Initialisiere Repo, falls nicht vorhanden
-    if not os.path.exists(os.path.join(backup_path, ".git")):
-        subprocess.run(["git", "init"], cwd=backup_path)
-        subprocess.run(["git", "remote", "add", "origin", repo_url_with_token], cwd=backup_path)
-    else:
-        subprocess.run(["git", "remote", "set-url", "origin", repo_url_with_token], cwd=backup_path)
+    if fresh:
+        # Frisch angelegtes Repo: Remote und Benutzer direkt in .git/config schreiben statt drei git-Aufrufen
+        lines = ['[remote "origin"]', f"\turl = {git_config_value(repo_url_with_token)}",
+                 "\tfetch = +refs/heads/*:refs/remotes/origin/*"]
+        if repo.get("git_user") or repo.get("git_email"):
+            lines.append("[user]")
+            if repo.get("git_user"):
+                lines.append(f"\tname = {git_config_value(repo['git_user'])}")
+            if repo.get("git_email"):
+                lines.append(f"\temail = {git_config_value(repo['git_email'])}")
+        with open(os.path.join(backup_path, ".git", "config"), "a") as f:
+            f.write("\n".join(lines) + "\n")
+        return
+    # Alle Schritte schreiben in .git/config und müssen daher nacheinander laufen (git sperrt die Datei)
+    await run_git(backup_path, "remote", "set-url", "origin", repo_url_with_token, quiet=True)
     if repo.get("git_user"):
-        subprocess.run(["git", "config", "user.name", repo["git_user"]], cwd=backup_path)
+        await run_git(backup_path, "config", "user.name", repo["git_user"], quiet=True)
     if repo.get("git_email"):
-        subprocess.run(["git", "config", "user.email", repo["git_email"]], cwd=backup_path)
+        await run_git(backup_path, "config", "user.email", repo["git_email"], quiet=True)
+
+async def git_init_main(backup_path):
+    # "git init -b" gibt es erst ab Git 2.28; ältere Versionen bekommen den Branch per "symbolic-ref"
+    try:
+        if await run_git(backup_path, "init", "-b", "main", quiet=True) == 0:
+            return True
+        if await run_git(backup_path, "init") == 0 and await run_git(backup_path, "symbolic-ref", "HEAD", "refs/heads/main") == 0:
+            return True
+    except OSError as e:
+        print(f"Fehler: {e}")
+    print(f"Fehler: Git-Repository in {backup_path} konnte nicht angelegt werden.")
+    return False
+
+async def git_push_async(backup_path, repo, files_to_add):
+    # Initialisiere Repo, falls nicht vorhanden
+    fresh = not os.path.exists(os.path.join(backup_path, ".git"))
+    if fresh and not await git_init_main(backup_path):
+        return
+    # Remote/Benutzer (.git/config) und "git add" (Index) sind unabhängig und laufen parallel
+    if not files_to_add:
+        files_to_add = list_changed_files(backup_path)
+    await asyncio.gather(
+        git_configure_repo(backup_path, repo, fresh),
+        run_git(backup_path, *GIT_ADD_FROM_STDIN, input=pathspec_input(files_to_add)),
+    )
+    await run_git(backup_path, "commit", "-m", f"Backup {datetime.datetime.now().isoformat()}")
+    if not git_on_main(backup_path):
+        await run_git(backup_path, "branch", "-M", "main")
+    await run_git(backup_path, "push", "-u", "origin", "main")
+
+def git_commit_and_push(backup_path, config, repo_idx, files_to_add=None):
+    repos = config.get("git_repos", [])
+    if not is_git_installed() or not repos or repo_idx >= len(repos):
+        return
     # Nur gezielt die gewünschten Dateien hinzufügen
-    if files_to_add:
-        subprocess.run(["git", "add"] + files_to_add, cwd=backup_path)
-    else:
-        subprocess.run(["git", "add", "."], cwd=backup_path)
-    subprocess.run(["git", "commit", "-m", f"Backup {datetime.datetime.now().isoformat()}"], cwd=backup_path)
-    subprocess.run(["git", "branch", "-M", "main"], cwd=backup_path)
-    subprocess.run(["git", "push", "-u", "origin", "main"], cwd=backup_path)
+    asyncio.run(git_push_async(backup_path, repos[repo_idx], files_to_add))
+
+def json_loads(data):
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj):
+    # Liefert bytes, eingerückt wie bisher lesbar
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
 
 def load_config():
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
-    return {"backup_path": str(Path.home() / "docker_backups")}
+    global CONFIG_CACHE
+    if CONFIG_CACHE is None:
+        try:
+            with open(CONFIG_FILE, "rb") as f:
+                CONFIG_CACHE = json_loads(f.read())
+        except FileNotFoundError:
+            CONFIG_CACHE = {"backup_path": str(Path.home() / "docker_backups")}
+    return CONFIG_CACHE
 
 
 def save_config(config):
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f)
+    global CONFIG_CACHE, CONFIG_WRITTEN
+    CONFIG_CACHE = config
+    data = json_dumps(config)
+    # Nur schreiben, wenn sich der Inhalt seit dem letzten Speichern geändert hat
+    if data == CONFIG_WRITTEN:
+        return
+    with open(CONFIG_FILE, "wb") as f:
+        f.write(data)
+    CONFIG_WRITTEN = data
+
+
+# Statische Menüeinträge, einmal beim Import angelegt und bei jedem Anzeigen wiederverwendet
+ACTION_CHOICES = [
+    {"name": "Container snapshoten", "value": "backup"},
+    {"name": "Wiederherstellen", "value": "restore"},
+    {"name": "Einstellungen", "value": "settings"},
+    {"name": "Beenden", "value": "exit"}
+]
+BACKUP_MODE_CHOICES = [
+    {"name": "Voll-Backup (Image sichern)", "value": "full"},
+    {"name": "Konfigurations-Backup (Einstellungen + Volumes, kein Image)", "value": "config"},
+    {"name": "Zurück", "value": "Zurück"}
+]
+BACKUP_MODE_CHOICES_REGISTRY = BACKUP_MODE_CHOICES[:2] + [
+    {"name": "Registry-Backup (Image in Registry pushen, kein Git)", "value": "registry"}
+] + BACKUP_MODE_CHOICES[2:]
+SETTINGS_CHOICES = [
+    {"name": "Backup-Pfad ändern", "value": "path"},
+    {"name": "Git-Repositories verwalten", "value": "git"},
+    {"name": "Git-Repository synchronisieren", "value": "gitpull"},
+    {"name": "Volumes direkt auf dem Host sichern/wiederherstellen an/aus (root nötig)", "value": "hosttar"},
+    {"name": "Umgebung erneut prüfen (Docker/Git)", "value": "recheck"},
+    {"name": "Software deinstallieren", "value": "uninstall"},
+    {"name": "Zurück", "value": "back"}
+]
+GIT_MENU_CHOICES = [
+    {"name": "Repository hinzufügen", "value": "add"},
+    {"name": "Repository löschen", "value": "delete"},
+    {"name": "Repositories auflisten", "value": "list"},
+    {"name": "Mit Git-Server abgleichen (Pull & Push)", "value": "sync"},
+    {"name": "Registry-Ziel festlegen (Images statt Git)", "value": "registry"},
+    {"name": "Zurück", "value": "back"}
+]
 
 
 def select_action():
-    return inquirer.select(
-        message="Aktion wählen:",
-        choices=[
-            {"name": "Container snapshoten", "value": "backup"},
-            {"name": "Wiederherstellen", "value": "restore"},
-            {"name": "Einstellungen", "value": "settings"},
-            {"name": "Beenden", "value": "exit"}
-        ]
-    ).execute()
+    return inquirer.select(message="Aktion wählen:", choices=ACTION_CHOICES).execute()
 
 
+def inspect_container(container_name, ttl=5.0):
+    # Liefert die geparste "docker inspect"-Ausgabe, pro Container nur ein Aufruf innerhalb der TTL
+    cached = INSPECT_CACHE.get(container_name)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    # Ein JSON-Objekt statt Array, als bytes direkt an orjson (falls vorhanden)
+    result = subprocess.run(["docker", "inspect", "--type", "container", "--format", "{{json .}}", container_name],
+                            capture_output=True)
+    if result.returncode != 0:
+        INSPECT_CACHE.pop(container_name, None)
+        return None
+    info = json_loads(result.stdout)
+    INSPECT_CACHE[container_name] = (time.monotonic(), info)
+    return info
+
+
+def invalidate_inspect(container_name):
+    INSPECT_CACHE.pop(container_name, None)
+
+
+def ttl_cache(ttl=2.0):
+    # Merkt sich das Ergebnis von Docker-Abfragen für kurze Zeit, damit Menü-Wechsel den Daemon nicht erneut fragen
+    def decorator(fn):
+        cache = {}
+        @wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit and now - hit[0] < ttl:
+                return hit[1]
+            value = fn(*args)
+            cache[args] = (now, value)
+            return value
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+@ttl_cache()
 def list_running_containers():
     result = subprocess.run(["docker", "ps", "--format", "{{.Names}}"], capture_output=True, text=True)
     containers = result.stdout.strip().split("\n") if result.stdout.strip() else []
     return containers
 
 
-def backup_container(container_name, backup_path, config=None, repo_idx=None):
+@ttl_cache()
+def docker_images(reference=None):
+    cmd = ["docker", "images", "--format", "{{.Repository}}:{{.Tag}}"]
+    if reference:
+        cmd[2:2] = ["--filter", f"reference={reference}"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+def remove_container(container_name):
+    subprocess.run(["docker", "rm", "-f", container_name], check=False)
+    invalidate_inspect(container_name)
+    list_running_containers.cache_clear()
+
+
+def backup_container_registry(container_name, registry_url):
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    # docker commit vergibt direkt den Registry-Namen, ein separates "docker tag" entfällt
+    image_ref = f"{registry_url.rstrip('/')}/{container_name.lower()}:{timestamp}"
+    try:
+        subprocess.run(["docker", "commit", "--change", f"LABEL {CONTAINER_LABEL}={container_name}", container_name, image_ref],
+                       check=True, stdout=subprocess.DEVNULL)
+    except subprocess.CalledProcessError:
+        print(f"Fehler: Snapshot von Container '{container_name}' konnte nicht erstellt werden.")
+        return False
+    try:
+        subprocess.run(["docker", "push", image_ref], check=True)
+    except subprocess.CalledProcessError:
+        print(f"Fehler: Push nach '{image_ref}' fehlgeschlagen. Bitte Anmeldung (docker login), Erreichbarkeit und Namen der Registry prüfen.")
+        return False
+    finally:
+        # Lokale Kopie entfernen, die Registry ist der Backup-Speicher
+        subprocess.run(["docker", "rmi", image_ref], check=False, stdout=subprocess.DEVNULL)
+    print(f"Backup in Registry gespeichert: {image_ref}")
+    return True
+
+def compress_cmd(threads=None, level=None):
+    # pigz komprimiert auf allen Kernen, gzip dient als Fallback
+    if shutil.which("pigz"):
+        cmd = ["pigz", "-c"]
+        if threads:
+            cmd += ["-p", str(threads)]
+    else:
+        cmd = ["gzip", "-c"]
+    if level:
+        cmd.append(f"-{level}")
+    return cmd
+
+def enlarge_pipe(pipe):
+    # Nur Linux: vergrößert den Kernel-Puffer der Pipe, damit Erzeuger und Kompressor seltener aufeinander warten
+    try:
+        import fcntl
+        if hasattr(fcntl, "F_SETPIPE_SZ"):
+            fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_BUFSIZE)
+    except (ImportError, OSError):
+        pass
+
+def read_err_file(err_file):
+    # Inhalt einer gesammelten stderr-Datei (TemporaryFile) für Fehlermeldungen
+    if err_file is None:
+        return None
+    err_file.seek(0)
+    return err_file.read().decode(errors="replace").strip()
+
+def run_pipeline(producer_cmd, consumer_cmd, stdout=None, stderr=None):
+    # Verbindet zwei Prozesse per Pipe ("producer | consumer"); stderr kann in eine Datei gesammelt werden
+    producer = subprocess.Popen(producer_cmd, stdout=subprocess.PIPE, stderr=stderr, bufsize=PIPE_BUFSIZE)
+    enlarge_pipe(producer.stdout)
+    consumer = subprocess.Popen(consumer_cmd, stdin=producer.stdout, stdout=stdout, stderr=stderr, bufsize=PIPE_BUFSIZE)
+    producer.stdout.close()
+    consumer.wait()
+    producer.wait()
+    for proc, cmd in ((producer, producer_cmd), (consumer, consumer_cmd)):
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=read_err_file(stderr))
+
+def pipe_to_file(producer_cmd, consumer_cmd, path, stderr=None):
+    # Schreibt die Ausgabe der Pipeline in die Zieldatei und liefert die Anzahl geschriebener Bytes.
+    # Geschrieben wird unter einem versteckten Namen im selben Ordner, umbenannt erst bei Erfolg:
+    # ein abgebrochenes Backup bleibt nie als scheinbar gültiges Archiv liegen
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.part")
+    try:
+        with open(tmp_path, "wb", buffering=PIPE_BUFSIZE) as out:
+            run_pipeline(producer_cmd, consumer_cmd, out, stderr)
+            # Der Kindprozess teilt sich die Dateiposition mit uns, tell() erspart ein weiteres stat()
+            size = out.tell()
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return size
+
+def backup_container(container_name, backup_path, config=None, repo_idx=None):
+    now = datetime.datetime.now()
+    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
     image_name = f"snapshot_{container_name}_{timestamp}"
-    archive_name = f"{timestamp}_{container_name}.tar"
-    archive_path = os.path.join(backup_path, str(datetime.datetime.now().year), str(datetime.datetime.now().month))
+    archive_name = f"{timestamp}_{container_name}.tar.gz"
+    archive_path = os.path.join(backup_path, str(now.year), str(now.month))
     os.makedirs(archive_path, exist_ok=True)
-    # Commit
-    subprocess.run(["docker", "commit", container_name, image_name], check=True)
-    # Save
+    # Commit (Ausgaben ohne Informationswert gehen nach /dev/null, Fehler weiterhin auf stderr)
+    subprocess.run(["docker", "commit", container_name, image_name], check=True, stdout=subprocess.DEVNULL)
+    # Save (direkt komprimiert, ohne unkomprimierte Zwischendatei)
     archive_full_path = os.path.join(archive_path, archive_name)
-    subprocess.run(["docker", "save", "-o", archive_full_path, image_name], check=True)
-    # Optional: Remove temp image
-    subprocess.run(["docker", "rmi", image_name], check=True)
+    try:
+        size = pipe_to_file(["docker", "save", image_name], compress_cmd(level=3), archive_full_path)
+    finally:
+        # Temporäres Snapshot-Image auch bei Fehlern entfernen
+        subprocess.run(["docker", "rmi", image_name], check=False, stdout=subprocess.DEVNULL)
     # Dateigröße anzeigen
-    size_mb = os.path.getsize(archive_full_path) / (1024 * 1024)
+    index_backup(archive_full_path, size)
+    size_mb = size / (1024 * 1024)
     print(f"Backup gespeichert: {archive_full_path} ({size_mb:.2f} MB)")
     # Nachfragen, ob auf Git hochgeladen werden soll
     upload = False
     if config and config.get("git_repos") and repo_idx is not None:
         upload = inquirer.confirm(message="Backup ins Git-Repository hochladen?", default=True).execute()
     if upload and repo_idx is not None:
-        git_commit_and_push(backup_path, config, repo_idx)
+        git_commit_and_push(backup_path, config, repo_idx, files_to_add=[os.path.relpath(archive_full_path, backup_path)])
+
+def volume_mountpoint(vol_name):
+    result = subprocess.run(["docker", "volume", "inspect", "-f", "{{.Mountpoint}}", vol_name], capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def ensure_helper_image():
+    # Einmal vor den Volume-Schleifen prüfen und ggf. laden, statt dass der erste (bzw. jeder parallele) Container implizit pullt
+    if subprocess.run(["docker", "image", "inspect", HELPER_IMAGE], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+        return
+    print(f"Lade Hilfs-Image '{HELPER_IMAGE}'...")
+    subprocess.run(["docker", "pull", "-q", HELPER_IMAGE], stdout=subprocess.DEVNULL, check=False)
+
+def backup_volume(vol_name, vol_tar, threads=None, use_host_tar=False):
+    # Läuft parallel: stderr wird je Job gesammelt und nur im Fehlerfall (als CalledProcessError.stderr) weitergegeben.
+    # Gibt ggf. einen Hinweis zurück, den der Aufrufer ausgibt
+    note = None
+    # Optional: tar direkt auf dem Host im Volume-Verzeichnis, spart den Start eines Containers (benötigt Leserechte, meist root)
+    if use_host_tar:
+        mountpoint = volume_mountpoint(vol_name)
+        if mountpoint and os.access(mountpoint, os.R_OK | os.X_OK):
+            try:
+                with tempfile.TemporaryFile() as err_file:
+                    pipe_to_file(["tar", "cf", "-", "-C", mountpoint, "."], compress_cmd(threads), vol_tar, err_file)
+                return None
+            except subprocess.CalledProcessError as e:
+                note = f"Host-tar für Volume {vol_name} fehlgeschlagen ({e.stderr or e}), Container wurde verwendet."
+    # tar läuft im Container, komprimiert wird auf dem Host ohne unkomprimierte Zwischendatei
+    tar_cmd = ["docker", "run", "--rm", "-v", f"{vol_name}:/data", HELPER_IMAGE, "tar", "cf", "-", "-C", "/data", "."]
+    with tempfile.TemporaryFile() as err_file:
+        pipe_to_file(tar_cmd, compress_cmd(threads), vol_tar, err_file)
+    return note
 
 def config_backup_container(container_name, backup_path, config=None, repo_idx=None):
-    import json as _json
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    now = datetime.datetime.now()
+    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
     archive_name = f"{timestamp}_{container_name}_config.tar"
-    archive_path = os.path.join(backup_path, str(datetime.datetime.now().year), str(datetime.datetime.now().month))
+    archive_path = os.path.join(backup_path, str(now.year), str(now.month))
     os.makedirs(archive_path, exist_ok=True)
     with tempfile.TemporaryDirectory() as tmpdir:
         # Inspect Container
-        result = subprocess.run(["docker", "inspect", container_name], capture_output=True, text=True)
-        if result.returncode != 0:
+        config_data = inspect_container(container_name)
+        if config_data is None:
             print("Fehler beim Auslesen der Container-Konfiguration.")
             return
-        config_data = _json.loads(result.stdout)[0]
         # Speichere das Original-Image (nicht das evtl. temporäre Snapshot-Image)
         original_image = config_data.get("Config", {}).get("Image", "")
-        # Volumes sichern
-        volumes = config_data['Mounts']
+        # Volumes parallel sichern
+        volumes = [v['Name'] for v in config_data['Mounts'] if v['Type'] == 'volume']
         volume_archives = []
-        for v in volumes:
-            if v['Type'] == 'volume':
-                vol_name = v['Name']
-                vol_tar = os.path.join(tmpdir, f"{vol_name}.tar.gz")
-                try:
-                    subprocess.run([
-                        "docker", "run", "--rm", "-v", f"{vol_name}:/data", "-v", f"{tmpdir}:/backup", "alpine",
-                        "sh", "-c", f"tar czf /backup/{vol_name}.tar.gz -C /data ."
-                    ], check=True)
-                    if os.path.exists(vol_tar):
-                        volume_archives.append(os.path.basename(vol_tar))
-                    else:
-                        print(f"Warnung: Volume-Archiv {vol_tar} wurde nicht erstellt!")
-                except Exception as e:
-                    print(f"Fehler beim Sichern des Volumes {vol_name}: {e}")
+        if volumes:
+            cpus = os.cpu_count() or 1
+            workers = min(len(volumes), cpus, MAX_ASYNC)
+            threads = max(1, cpus // workers)
+            use_host_tar = bool(config and config.get("use_host_tar"))
+            ensure_helper_image()
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futures = {
+                    ex.submit(backup_volume, vol_name, os.path.join(tmpdir, f"{vol_name}.tar.gz"), threads, use_host_tar): vol_name
+                    for vol_name in volumes
+                }
+                for future in as_completed(futures):
+                    vol_name = futures[future]
+                    try:
+                        note = future.result()
+                        if note:
+                            print(note)
+                        volume_archives.append(f"{vol_name}.tar.gz")
+                    except Exception as e:
+                        print(f"Fehler beim Sichern des Volumes {vol_name}: {getattr(e, 'stderr', None) or e}")
         # Schreibe Info-Text und Config-JSON ins temp dir
         info = {
             "info": "Dies ist ein platzsparendes Konfigurations-Backup. Es enthält KEINE Container-Daten außer den Volumes! Nur die Einstellungen, das verwendete Image und die Volumes werden gespeichert. Beim Wiederherstellen wird das Image erneut aus dem Internet geladen. Daten, die nicht in Volumes liegen, gehen verloren! Für vollständige Datensicherung bitte Volumes separat sichern.",
@@ -209,12 +569,17 @@ def config_backup_container(container_name, backup_path, config=None, repo_idx=N
             "volumes": volume_archives
         }
         config_json_path = os.path.join(tmpdir, "config.json")
-        with open(config_json_path, "w") as f:
-            _json.dump(info, f, indent=2)
+        with open(config_json_path, "wb") as f:
+            f.write(json_dumps(info))
         # Erstelle das Archiv
         archive_full_path = os.path.join(archive_path, archive_name)
-        subprocess.run(["tar", "cf", archive_full_path, "-C", tmpdir, "."], check=True)
-        print(f"Konfigurations-Backup gespeichert: {archive_full_path}")
+        # Nur config.json und die erfolgreich gesicherten Volumes, nie Reste fehlgeschlagener Jobs
+        with tarfile.open(archive_full_path, "w", copybufsize=COPY_BUFSIZE) as tf:
+            for name in sorted(volume_archives + ["config.json"]):
+                tf.add(os.path.join(tmpdir, name), arcname=name)
+        size = os.stat(archive_full_path).st_size
+        index_backup(archive_full_path, size)
+        print(f"Konfigurations-Backup gespeichert: {archive_full_path} ({size / (1024 * 1024):.2f} MB)")
         print(f"Gesicherte Volumes: {', '.join(volume_archives) if volume_archives else 'Keine Volumes gefunden!'}")
         print("\nINFO: Dieses Backup enthält die Einstellungen, das verwendete Image und die Volumes.\n" \
               "Beim Wiederherstellen wird das Image erneut geladen. Daten, die nicht in Volumes liegen, gehen verloren!")
@@ -223,117 +588,241 @@ def config_backup_container(container_name, backup_path, config=None, repo_idx=N
         if config and config.get("git_repos") and repo_idx is not None:
             upload = inquirer.confirm(message="Backup ins Git-Repository hochladen?", default=True).execute()
         if upload and repo_idx is not None:
-            files_to_add = [os.path.basename(archive_full_path)]
-            git_commit_and_push(archive_path, config, repo_idx, files_to_add=files_to_add)
+            files_to_add = [os.path.relpath(archive_full_path, backup_path)]
+            git_commit_and_push(backup_path, config, repo_idx, files_to_add=files_to_add)
             print("Backup-Archiv wurde ins Git-Repository hochgeladen.")
 
+def remove_restore_helpers(helpers):
+    if helpers:
+        subprocess.run(["docker", "rm", "-f", *helpers], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def create_restore_helpers(vol_names, count):
+    # Nie gestartete Hilfscontainer: "docker create -v" legt fehlende Volumes an, "docker cp" schreibt anschließend
+    # über sie hinein (statt eines "docker run ... tar" pro Volume). Docker sperrt einen Container für die Dauer
+    # eines "docker cp", daher ein Hilfscontainer pro Worker, die Volumes werden reihum verteilt
+    vol_names = list(dict.fromkeys(vol_names))
+    count = max(1, min(count, len(vol_names)))
+    helpers, targets = [], {}
+    try:
+        for h in range(count):
+            cmd = ["docker", "create"]
+            paths = {}
+            for i, vol_name in enumerate(vol_names[h::count]):
+                cmd += ["-v", f"{vol_name}:/restore/{i}"]
+                paths[vol_name] = f"/restore/{i}"
+            result = subprocess.run(cmd + [HELPER_IMAGE], capture_output=True, text=True, check=True)
+            helper = result.stdout.strip()
+            helpers.append(helper)
+            targets.update({vol_name: f"{helper}:{path}" for vol_name, path in paths.items()})
+    except subprocess.CalledProcessError:
+        remove_restore_helpers(helpers)
+        raise
+    return helpers, targets
+
+def stream_to_volume(target, data):
+    # Schreibt data (gzip-Daten, memoryview auf das gemappte Archiv) per "docker cp" ins Volume, ohne Zwischendatei.
+    # Docker entpackt gzip-komprimierte tar-Streams selbst, ein Entpacker-Prozess auf dem Host entfällt.
+    # target ist "<Hilfscontainer>:<Pfad>"; -a übernimmt Besitzer und Rechte aus dem Archiv
+    cp_cmd = ["docker", "cp", "-a", "-", target]
+    # stderr wird gesammelt, damit sich die Ausgaben parallel laufender Wiederherstellungen nicht vermischen
+    with tempfile.TemporaryFile() as err_file:
+        proc = subprocess.Popen(cp_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=err_file, bufsize=PIPE_BUFSIZE)
+        enlarge_pipe(proc.stdin)
+        try:
+            # Slices der memoryview sind Kopien-frei: die Daten gehen direkt aus dem Page-Cache in die Pipe
+            for offset in range(0, len(data), COPY_BUFSIZE):
+                with data[offset:offset + COPY_BUFSIZE] as chunk:
+                    proc.stdin.write(chunk)
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        proc.wait()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cp_cmd, stderr=read_err_file(err_file))
+
+def read_config_archive(archive_path):
+    # Liest nur die tar-Header und config.json; die Volume-Archive bleiben im äußeren tar
+    with tarfile.open(archive_path, "r:") as tar:
+        members = {os.path.normpath(m.name): m for m in tar.getmembers() if m.isfile()}
+        if "config.json" not in members:
+            return None, members
+        info = json_loads(tar.extractfile(members["config.json"]).read())
+    return info, members
+
+def open_gzip(fileobj):
+    # Entpackt gzip im eigenen Prozess, mit isal falls installiert
+    return (igzip.IGzipFile if igzip else gzip.GzipFile)(fileobj=fileobj, mode="rb")
+
+def restore_volume_on_host(vol_name, archive_path, member):
+    # Entpackt direkt ins Volume-Verzeichnis auf dem Host, ohne Container (benötigt Schreibrechte, meist root).
+    # Ohne tarfile-Filter (Python < 3.12 ohne Backport) wird nicht auf dem Host entpackt.
+    # Gibt (erfolgreich, Hinweis) zurück; läuft in einem Worker-Thread, ausgegeben wird vom Aufrufer
+    if not hasattr(tarfile, "tar_filter"):
+        return False, None
+    # Das Volume existiert bereits: restore_volumes hat es über einen Hilfscontainer (oder "docker volume create") angelegt
+    mountpoint = volume_mountpoint(vol_name)
+    if not mountpoint or not os.access(mountpoint, os.W_OK):
+        return False, None
+    try:
+        # extractfile liefert einen auf das Volume-Archiv begrenzten, gepufferten Leser im äußeren tar
+        with tarfile.open(archive_path, "r:") as outer, outer.extractfile(member) as src, open_gzip(src) as stream, \
+                tarfile.open(fileobj=stream, mode="r|", copybufsize=COPY_BUFSIZE) as inner:
+            # "tar" statt "data": Besitzer bleiben erhalten (numerisch, wie im Container), Pfade außerhalb des Volumes werden abgelehnt
+            inner.extractall(mountpoint, numeric_owner=True, filter="tar")
+    except Exception as e:
+        return False, f"Host-Entpacken für Volume {vol_name} fehlgeschlagen ({e}), verwende Container..."
+    return True, None
+
+def restore_volume(vol_name, vol_tar, target, archive_path, archive_view, members, use_host_tar=False):
+    # Gibt (erfolgreich, Meldung) zurück; die Meldung wird vom Aufrufer ausgegeben
+    member = members.get(vol_tar)
+    if member is None:
+        return False, f"Fehler: Volume-Archiv {vol_tar} nicht gefunden, Volume {vol_name} bleibt leer!"
+    prefix = ""
+    if use_host_tar:
+        ok, note = restore_volume_on_host(vol_name, archive_path, member)
+        if ok:
+            return True, f"Volume {vol_name} wiederhergestellt aus {vol_tar} (Host)."
+        if note:
+            prefix = note + "\n"
+    if target is None:
+        return False, f"{prefix}Fehler: Volume {vol_name} konnte nicht wiederhergestellt werden (kein Hilfscontainer)."
+    # Gelesen wird direkt der Bereich des Volume-Archivs im äußeren tar
+    try:
+        with archive_view[member.offset_data:member.offset_data + member.size] as data:
+            stream_to_volume(target, data)
+    except subprocess.CalledProcessError as e:
+        return False, f"{prefix}Fehler beim Wiederherstellen des Volumes {vol_name}: {e.stderr or e}"
+    return True, f"{prefix}Volume {vol_name} wiederhergestellt aus {vol_tar}."
+
+def restore_volumes(jobs, archive_path, members, use_host_tar=False):
+    # jobs: Liste aus (Volume-Name, Archivname); parallel, außer mit --serial-restore (z.B. bei langsamen Platten).
+    # Gibt True zurück, wenn alle Volumes wiederhergestellt wurden
+    if not jobs:
+        return True
+    ensure_helper_image()
+    vol_names = [vol_name for vol_name, _ in jobs]
+    workers = 1 if SERIAL_RESTORE else min(len(jobs), os.cpu_count() or 1, MAX_ASYNC)
+    helpers, targets = [], {}
+    try:
+        helpers, targets = create_restore_helpers(vol_names, workers)
+    except subprocess.CalledProcessError as e:
+        print(f"Fehler beim Anlegen des Hilfscontainers für die Volumes: {e.stderr.strip() or e}")
+        if not use_host_tar:
+            return False
+        print("Versuche, die Volumes direkt auf dem Host wiederherzustellen...")
+        # Ohne Hilfscontainer werden die Volumes selbst angelegt, damit sie einen Mountpoint haben
+        for vol_name in dict.fromkeys(vol_names):
+            subprocess.run(["docker", "volume", "create", vol_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    failed = 0
+    try:
+        # Das Archiv wird einmal gemappt und von allen Threads gemeinsam (nur lesend) genutzt
+        with open(archive_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view, ThreadPoolExecutor(max_workers=workers) as ex:
+                for ok, msg in ex.map(lambda job: restore_volume(job[0], job[1], targets.get(job[0]), archive_path, view, members, use_host_tar), jobs):
+                    print(msg)
+                    failed += not ok
+    finally:
+        remove_restore_helpers(helpers)
+    if failed:
+        print(f"{failed} von {len(jobs)} Volumes konnten nicht wiederhergestellt werden.")
+    return not failed
+
+def config_run_cmd(container_name, image, config_data):
+    # Baut "docker run" aus der gespeicherten inspect-Ausgabe; die Teilbäume werden einmal herausgezogen
+    hc = config_data['HostConfig']
+    cfg = config_data['Config']
+    nets = config_data['NetworkSettings']['Networks'] or {}
+    run_cmd = ["docker", "run", "-d", "--name", container_name]
+    # Ports
+    run_cmd.extend(arg for container_port, bindings in (hc.get('PortBindings') or {}).items() for binding in bindings or ()
+                   if binding.get("HostPort")
+                   for arg in ("-p", f"{binding['HostPort']}:{container_port.split('/')[0]}"))
+    # Env
+    run_cmd.extend(arg for env in cfg.get('Env') or () for arg in ("-e", env))
+    # Labels
+    run_cmd.extend(arg for k, v in (cfg.get('Labels') or {}).items() for arg in ("--label", f"{k}={v}"))
+    # Netzwerke (optional, Standard: bridge)
+    run_cmd.extend(arg for net in nets for arg in ("--network", net))
+    # Restart-Policy
+    restart = hc.get('RestartPolicy') or {}
+    if restart.get('Name'):
+        run_cmd.extend(("--restart", restart['Name']))
+    # Volumes an den Container mounten
+    run_cmd.extend(arg for v in config_data.get('Mounts') or () if v['Type'] == 'volume'
+                   for arg in ("-v", f"{v['Name']}:{v['Destination']}"))
+    run_cmd.append(image)
+    return run_cmd
+
 def config_restore_backup(config):
-    import json as _json
     backup_path = config["backup_path"]
-    # Suche alle *_config.json Backups
-    config_backups = []
-    for year in os.listdir(backup_path):
-        year_path = os.path.join(backup_path, year)
-        if not os.path.isdir(year_path):
-            continue
-        for month in os.listdir(year_path):
-            month_path = os.path.join(year_path, month)
-            if not os.path.isdir(month_path):
-                continue
-            for file in os.listdir(month_path):
-                if file.endswith("_config.json"):
-                    config_backups.append(os.path.join(year, month, file))
+    # Alle Konfigurations-Backups (*_config.tar) aus dem Index
+    config_backups = list_backups(backup_path, ("config",))
     if not config_backups:
         print("Keine Konfigurations-Backups gefunden.")
-        input("[Enter] für Hauptmenü...")
+        pause()
         return
     choices = [{"name": b, "value": b} for b in config_backups] + [{"name": "Zurück", "value": "Zurück"}]
     backup_choice = inquirer.select(message="Konfigurations-Backup wählen (STRG+C für Hauptmenü):", choices=choices).execute()
     if backup_choice == "Zurück":
         return
     full_backup_path = os.path.join(backup_path, backup_choice)
-    with open(full_backup_path, "r") as f:
-        info = _json.load(f)
+    info, members = read_config_archive(full_backup_path)
+    if info is None:
+        print("Fehler: config.json im Archiv nicht gefunden!")
+        pause()
+        return
     image = info.get("image")
     container_name = info.get("container_name")
     config_data = info.get("config")
     volume_archives = info.get("volumes", [])
     print(f"Stelle Container '{container_name}' mit Image '{image}' wieder her...")
-    # Image laden
-    subprocess.run(["docker", "pull", image], check=True)
+    # Image laden (ohne Fortschrittsausgabe)
+    subprocess.run(["docker", "pull", "-q", image], check=True, stdout=subprocess.DEVNULL)
+    docker_images.cache_clear()
     # Entferne ggf. alten Container
-    subprocess.run(["docker", "rm", "-f", container_name], check=False)
+    remove_container(container_name)
     # Volumes wiederherstellen
-    archive_dir = os.path.dirname(full_backup_path)
-    for vol_tar in volume_archives:
-        vol_name = vol_tar.split(f"_{container_name}_")[-1].replace(".tar.gz", "")
-        # Volume anlegen (falls nicht vorhanden)
-        subprocess.run(["docker", "volume", "create", vol_name], check=False)
-        # Daten ins Volume extrahieren
-        vol_tar_path = os.path.join(archive_dir, vol_tar)
-        if os.path.exists(vol_tar_path):
-            subprocess.run([
-                "docker", "run", "--rm", "-v", f"{vol_name}:/data", "-v", f"{archive_dir}:/backup", "alpine",
-                "sh", "-c", f"tar xzf /backup/{vol_tar} -C /data"
-            ], check=True)
-            print(f"Volume {vol_name} wiederhergestellt aus {vol_tar}.")
-        else:
-            print(f"Warnung: Volume-Archiv {vol_tar} nicht gefunden, Volume bleibt leer!")
+    jobs = [(vol_tar.split(f"_{container_name}_")[-1].replace(".tar.gz", ""), vol_tar) for vol_tar in volume_archives]
+    if not restore_volumes(jobs, full_backup_path, members, config.get("use_host_tar", False)):
+        print(f"Container '{container_name}' wird nicht gestartet, damit er nicht mit unvollständigen Volumes läuft.")
+        pause()
+        return
     # Starte neuen Container mit gespeicherter Config
-    run_cmd = ["docker", "run", "-d", "--name", container_name]
-    # Ports
-    port_bindings = config_data['HostConfig'].get('PortBindings', {})
-    for container_port, bindings in port_bindings.items():
-        if bindings:
-            for binding in bindings:
-                host_port = binding.get("HostPort")
-                if host_port:
-                    run_cmd += ["-p", f"{host_port}:{container_port.split('/')[0]}"]
-    # Env
-    for env in config_data['Config'].get('Env', []):
-        run_cmd += ["-e", env]
-    # Labels
-    for k, v in config_data['Config'].get('Labels', {}).items():
-        run_cmd += ["--label", f"{k}={v}"]
-    # Netzwerke (optional, Standard: bridge)
-    networks = list(config_data['NetworkSettings']['Networks'].keys())
-    for net in networks:
-        run_cmd += ["--network", net]
-    # Restart-Policy
-    restart = config_data['HostConfig'].get('RestartPolicy', {})
-    if restart.get('Name'):
-        run_cmd += ["--restart", restart['Name']]
-    # Volumes an den Container mounten
-    for v in config_data['Mounts']:
-        if v['Type'] == 'volume':
-            run_cmd += ["-v", f"{v['Name']}:{v['Destination']}"]
-    run_cmd.append(image)
+    run_cmd = config_run_cmd(container_name, image, config_data)
     subprocess.run(run_cmd, check=True)
+    list_running_containers.cache_clear()
     print(f"Container '{container_name}' wurde aus Konfigurations-Backup wiederhergestellt.")
     print("\nINFO: Einstellungen, Image und Volumes wurden wiederhergestellt. Daten, die nicht in Volumes lagen, sind verloren!")
-    input("[Enter] für Hauptmenü...")
+    pause()
 
 def backup_menu(config):
     try:
-        mode = inquirer.select(
-            message="Backup-Modus wählen:",
-            choices=[
-                {"name": "Voll-Backup (Image sichern)", "value": "full"},
-                {"name": "Konfigurations-Backup (Einstellungen + Volumes, kein Image)", "value": "config"},
-                {"name": "Zurück", "value": "Zurück"}
-            ]
-        ).execute()
+        mode_choices = BACKUP_MODE_CHOICES_REGISTRY if config.get("registry_url") else BACKUP_MODE_CHOICES
+        mode = inquirer.select(message="Backup-Modus wählen:", choices=mode_choices).execute()
         if mode == "Zurück":
             return
         containers = list_running_containers()
         if not containers:
             print("Keine laufenden Container gefunden.")
-            input("[Enter] für Zurück zum Hauptmenü...")
+            pause("[Enter] für Zurück zum Hauptmenü...")
             return
         choices = [{"name": c, "value": c} for c in containers] + [{"name": "Zurück", "value": "Zurück"}]
         container = inquirer.select(message="Container wählen (STRG+C für Hauptmenü):", choices=choices).execute()
         if container == "Zurück":
             return
+        if mode == "registry":
+            if backup_container_registry(container, config["registry_url"]):
+                pause("Registry-Backup abgeschlossen. [Enter] für Hauptmenü...")
+            else:
+                pause()
+            return
         repo_idx = None
         if config.get("git_repos"):
             repo_choices = [
@@ -343,10 +832,10 @@ def backup_menu(config):
             repo_idx = inquirer.select(message="In welches Git-Repo hochladen?", choices=repo_choices).execute()
         if mode == "full":
             backup_container(container, config["backup_path"], config, repo_idx)
-            input("Backup abgeschlossen. [Enter] für Hauptmenü...")
+            pause("Backup abgeschlossen. [Enter] für Hauptmenü...")
         elif mode == "config":
             config_backup_container(container, config["backup_path"], config, repo_idx)
-            input("Konfigurations-Backup abgeschlossen. [Enter] für Hauptmenü...")
+            pause("Konfigurations-Backup abgeschlossen. [Enter] für Hauptmenü...")
     except KeyboardInterrupt:
         print("\nZurück zum Hauptmenü...")
     return
@@ -365,8 +854,9 @@ def uninstall_software():
         except PermissionError:
             print("Keine Berechtigung. Passwort wird für sudo benötigt...")
             password = getpass.getpass("Bitte Admin-Passwort eingeben: ")
-            cmd = f'echo "{password}" | sudo -S rm "{bin_path}"'
-            result = subprocess.run(cmd, shell=True)
+            # Passwort über stdin an sudo, ohne Shell und ohne Interpolation in die Kommandozeile
+            result = subprocess.run(["sudo", "-S", "rm", "--", bin_path], input=password + "\n", text=True,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             if result.returncode == 0:
                 print("/usr/local/bin/docker-backuptool mit sudo entfernt.")
             else:
@@ -401,33 +891,26 @@ def uninstall_software():
 def git_pull_repo(config):
     if not is_git_installed() or not config.get("git_repo"):
         print("Git ist nicht konfiguriert.")
-        input("[Enter] für Hauptmenü...")
+        pause()
         return
     backup_path = config["backup_path"]
     if not os.path.exists(os.path.join(backup_path, ".git")):
         print("Kein Git-Repository initialisiert. Bitte zuerst ein Backup machen und Git konfigurieren.")
-        input("[Enter] für Hauptmenü...")
+        pause()
         return
     print("Synchronisiere mit Git-Repository...")
     result = subprocess.run(["git", "pull"], cwd=backup_path)
     if result.returncode == 0:
+        # Per Pull hinzugekommene Backups in den Index aufnehmen
+        rebuild_index(backup_path)
         print("Synchronisierung erfolgreich.")
     else:
         print("Fehler bei der Synchronisierung.")
-    input("[Enter] für Hauptmenü...")
+    pause()
 
 def git_menu(config):
     while True:
-        choice = inquirer.select(
-            message="Git-Einstellungen:",
-            choices=[
-                {"name": "Repository hinzufügen", "value": "add"},
-                {"name": "Repository löschen", "value": "delete"},
-                {"name": "Repositories auflisten", "value": "list"},
-                {"name": "Mit Git-Server abgleichen (Pull & Push)", "value": "sync"},
-                {"name": "Zurück", "value": "back"}
-            ]
-        ).execute()
+        choice = inquirer.select(message="Git-Einstellungen:", choices=GIT_MENU_CHOICES).execute()
         if choice == "add":
             repo_url = inquirer.text(message="Git-Repository-URL (z.B. https://github.com/user/repo.git):").execute()
             username = inquirer.text(message="Git-Benutzername:").execute()
@@ -445,7 +928,7 @@ def git_menu(config):
                 test_result = subprocess.run(["git", "ls-remote", repo_url_with_token], capture_output=True)
                 if test_result.returncode != 0:
                     print("Fehler: Token ungültig oder keine Berechtigung für das Repo!")
-                    input("[Enter] für Zurück...")
+                    pause("[Enter] für Zurück...")
                     continue
                 else:
                     print("Token erfolgreich geprüft.")
@@ -458,12 +941,12 @@ def git_menu(config):
             config.setdefault("git_repos", []).append(repo_entry)
             save_config(config)
             print("Repository hinzugefügt.")
-            input("[Enter] für Zurück...")
+            pause("[Enter] für Zurück...")
         elif choice == "delete":
             repos = config.get("git_repos", [])
             if not repos:
                 print("Keine Repositories gespeichert.")
-                input("[Enter] für Zurück...")
+                pause("[Enter] für Zurück...")
                 continue
             repo_choices = [
                 {"name": f"{r['repo_url']} ({r['git_user']})", "value": i}
@@ -474,7 +957,7 @@ def git_menu(config):
                 del config["git_repos"][idx]
                 save_config(config)
                 print("Repository gelöscht.")
-                input("[Enter] für Zurück...")
+                pause("[Enter] für Zurück...")
         elif choice == "list":
             repos = config.get("git_repos", [])
             if not repos:
@@ -483,9 +966,21 @@ def git_menu(config):
                 print("Gespeicherte Repositories:")
                 for r in repos:
                     print(f"- {r['repo_url']} (User: {r['git_user']})")
-            input("[Enter] für Zurück...")
+            pause("[Enter] für Zurück...")
         elif choice == "sync":
             git_sync_repo(config)
+        elif choice == "registry":
+            registry_url = inquirer.text(
+                message=f"Registry angeben, leer zum Entfernen (aktuell: {config.get('registry_url') or '-'}):"
+            ).execute()
+            if registry_url:
+                config["registry_url"] = registry_url.rstrip("/")
+                print(f"Registry-Ziel gespeichert: {config['registry_url']}")
+            else:
+                config.pop("registry_url", None)
+                print("Registry-Ziel entfernt.")
+            save_config(config)
+            pause("[Enter] für Zurück...")
         elif choice == "back":
             return
 
@@ -493,7 +988,7 @@ def git_menu(config):
 def git_sync_repo(config):
     if not is_git_installed() or not config.get("git_repos"):
         print("Git ist nicht konfiguriert.")
-        input("[Enter] für Zurück...")
+        pause("[Enter] für Zurück...")
         return
     backup_path = config["backup_path"]
     repo_choices = [
@@ -502,126 +997,184 @@ def git_sync_repo(config):
     ]
     repo_idx = inquirer.select(message="Welches Git-Repo synchronisieren?", choices=repo_choices).execute()
     repo = config["git_repos"][repo_idx]
-    repo_url = repo["repo_url"]
-    # Token in die URL einbauen, falls vorhanden
-    if repo.get("git_token") and repo.get("git_user"):
-        from urllib.parse import urlparse, urlunparse
-        parsed = urlparse(repo_url)
-        netloc = f"{repo['git_user']}:{repo['git_token']}@{parsed.hostname}"
-        if parsed.port:
-            netloc += f":{parsed.port}"
-        repo_url_with_token = urlunparse((parsed.scheme, netloc, parsed.path, '', '', ''))
-    else:
-        repo_url_with_token = repo_url
     # Initialisiere Repo, falls nicht vorhanden
-    if not os.path.exists(os.path.join(backup_path, ".git")):
-        subprocess.run(["git", "init"], cwd=backup_path)
-        subprocess.run(["git", "remote", "add", "origin", repo_url_with_token], cwd=backup_path)
-    else:
-        subprocess.run(["git", "remote", "set-url", "origin", repo_url_with_token], cwd=backup_path)
-    if repo.get("git_user"):
-        subprocess.run(["git", "config", "user.name", repo["git_user"]], cwd=backup_path)
-    if repo.get("git_email"):
-        subprocess.run(["git", "config", "user.email", repo["git_email"]], cwd=backup_path)
+    fresh = not os.path.exists(os.path.join(backup_path, ".git"))
+    if fresh and not asyncio.run(git_init_main(backup_path)):
+        pause("[Enter] für Zurück...")
+        return
+    asyncio.run(git_configure_repo(backup_path, repo, fresh))
     print("Hole Änderungen vom Git-Server (git pull)...")
     pull_result = subprocess.run(["git", "pull"], cwd=backup_path)
     if pull_result.returncode == 0:
+        rebuild_index(backup_path)
         print("Pull erfolgreich.")
     else:
         print("Fehler beim Pull.")
     print("Übertrage lokale Änderungen zum Git-Server (git push)...")
-    subprocess.run(["git", "add", "."], cwd=backup_path)
+    changed = list_changed_files(backup_path)
+    if changed:
+        subprocess.run(["git"] + GIT_ADD_FROM_STDIN, cwd=backup_path, input=pathspec_input(changed))
     subprocess.run(["git", "commit", "-m", f"Sync {datetime.datetime.now().isoformat()}"] , cwd=backup_path)
     push_result = subprocess.run(["git", "push", "-u", "origin", "main"], cwd=backup_path)
     if push_result.returncode == 0:
         print("Push erfolgreich.")
     else:
         print("Fehler beim Push.")
-    input("[Enter] für Zurück...")
+    pause("[Enter] für Zurück...")
 
 def settings_menu(config):
     try:
-        choice = inquirer.select(
-            message="Einstellungen (STRG+C für Hauptmenü):",
-            choices=[
-                {"name": "Backup-Pfad ändern", "value": "path"},
-                {"name": "Git-Repositories verwalten", "value": "git"},
-                {"name": "Git-Repository synchronisieren", "value": "gitpull"},
-                {"name": "Software deinstallieren", "value": "uninstall"},
-                {"name": "Zurück", "value": "back"}
-            ]
-        ).execute()
+        choice = inquirer.select(message="Einstellungen (STRG+C für Hauptmenü):", choices=SETTINGS_CHOICES).execute()
         if choice == "path":
             new_path = inquirer.text(message=f"Backup-Pfad angeben (aktuell: {config['backup_path']}):").execute()
             if new_path:
                 config["backup_path"] = new_path
                 save_config(config)
                 print(f"Backup-Pfad gespeichert: {new_path}")
-                input("[Enter] für Hauptmenü...")
+                pause()
         elif choice == "git":
             git_menu(config)
         elif choice == "gitpull":
             git_pull_repo(config)
+        elif choice == "hosttar":
+            config["use_host_tar"] = not config.get("use_host_tar", False)
+            save_config(config)
+            print(f"Host-tar für Volumes {'aktiviert' if config['use_host_tar'] else 'deaktiviert'}.")
+            pause()
+        elif choice == "recheck":
+            is_docker_running.cache_clear()
+            is_git_installed.cache_clear()
+            print(f"Docker: {'läuft' if is_docker_running() else 'nicht erreichbar'}")
+            print(f"Git: {'installiert' if is_git_installed() else 'nicht installiert'}")
+            pause()
         elif choice == "uninstall":
             uninstall_software()
-            input("[Enter] für Hauptmenü...")
+            pause()
         # Bei "back" einfach zurück
     except KeyboardInterrupt:
         print("\nZurück zum Hauptmenü...")
     return
 
 
-def list_backups(backup_path):
-    backups = []
-    for year in os.listdir(backup_path):
-        year_path = os.path.join(backup_path, year)
-        if not os.path.isdir(year_path):
-            continue
-        for month in os.listdir(year_path):
-            month_path = os.path.join(year_path, month)
-            if not os.path.isdir(month_path):
+def iter_backups(backup_path, suffix):
+    # Durchläuft <Jahr>/<Monat>/<Datei> mit os.scandir; is_dir() nutzt die Daten aus dem Verzeichnis-Listing
+    with os.scandir(backup_path) as years:
+        for year in years:
+            if not year.is_dir(follow_symlinks=False):
                 continue
-            for file in os.listdir(month_path):
-                if file.endswith(".tar"):
-                    backups.append(os.path.join(year, month, file))
-    return backups
+            with os.scandir(year.path) as months:
+                for month in months:
+                    if not month.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(month.path) as files:
+                        for file in files:
+                            if file.name.endswith(suffix):
+                                yield os.path.join(year.name, month.name, file.name), file
 
-def get_container_ports(container_name):
-    result = subprocess.run([
-        "docker", "inspect", container_name,
-        "--format", '{{json .HostConfig.PortBindings}}'
-    ], capture_output=True, text=True)
-    import json as _json
+def open_index():
+    os.makedirs(os.path.dirname(INDEX_FILE), exist_ok=True)
+    conn = sqlite3.connect(INDEX_FILE)
+    conn.execute("CREATE TABLE IF NOT EXISTS backups (path TEXT PRIMARY KEY, kind TEXT, ts INTEGER, container TEXT, size INTEGER)")
+    # Backup-Ordner, die schon einmal komplett durchsucht wurden (einzelne Einträge aus index_backup zählen nicht)
+    conn.execute("CREATE TABLE IF NOT EXISTS indexed_paths (prefix TEXT PRIMARY KEY)")
+    return conn
+
+def parse_backup_filename(filename):
+    # <JJJJ-MM-TT>_<HH-MM-SS>_<Container>[_config].tar[.gz] -> (Art, Zeitstempel, Container)
+    kind = "config" if filename.endswith("_config.tar") else "full"
+    stem = filename
+    for suffix in ("_config.tar", ".tar.gz", ".tar"):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+            break
     try:
-        port_bindings = _json.loads(result.stdout)
-        ports = []
-        if port_bindings:
-            for container_port, bindings in port_bindings.items():
-                if bindings:
-                    for binding in bindings:
-                        host_port = binding.get("HostPort")
-                        if host_port:
-                            ports.append((host_port, container_port.split("/")[0]))
-        return ports
-    except Exception:
-        return []
+        ts = int(datetime.datetime.strptime(stem[:19], "%Y-%m-%d_%H-%M-%S").timestamp())
+        container = stem[20:]
+    except ValueError:
+        ts = None
+        container = stem.split("_", 2)[-1]
+    return kind, ts, container
 
-def get_container_config(container_name):
-    import json as _json
-    result = subprocess.run(["docker", "inspect", container_name], capture_output=True, text=True)
-    if result.returncode != 0:
-        return None
-    info = _json.loads(result.stdout)[0]
-    config = {}
-    # Ports
-    config['ports'] = []
-    port_bindings = info['HostConfig'].get('PortBindings', {})
+def index_backup(archive_full_path, size):
+    # Der Index ist nur ein Zwischenspeicher: ein Fehler hier darf das Backup (und den Git-Upload) nicht abbrechen
+    kind, ts, container = parse_backup_filename(os.path.basename(archive_full_path))
+    try:
+        with closing(open_index()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO backups VALUES (?, ?, ?, ?, ?)",
+                         (os.path.abspath(archive_full_path), kind, ts or int(time.time()), container, size))
+        return
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warnung: Backup-Index konnte nicht aktualisiert werden ({e}).")
+    # Backup-Ordner als "nicht durchsucht" markieren, damit list_backups ihn beim nächsten Mal neu einliest
+    backup_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(archive_full_path))))
+    try:
+        with closing(open_index()) as conn, conn:
+            conn.execute("DELETE FROM indexed_paths WHERE prefix = ?", (index_prefix(backup_path),))
+    except (sqlite3.Error, OSError):
+        print("Der Index kann mit 'docker-backuptool --rebuild-index' neu aufgebaut werden.")
+
+def index_prefix(backup_path):
+    return os.path.join(os.path.abspath(backup_path), "")
+
+def rebuild_index(backup_path):
+    # Einmaliger Durchlauf des Backup-Ordners, ersetzt alle Einträge unterhalb von backup_path
+    prefix = index_prefix(backup_path)
+    rows = []
+    if os.path.isdir(backup_path):
+        for rel, entry in iter_backups(backup_path, (".tar", ".tar.gz")):
+            st = entry.stat()
+            kind, ts, container = parse_backup_filename(entry.name)
+            rows.append((prefix + rel, kind, ts or int(st.st_mtime), container, st.st_size))
+    with closing(open_index()) as conn, conn:
+        conn.execute("DELETE FROM backups WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))
+        conn.executemany("INSERT OR REPLACE INTO backups VALUES (?, ?, ?, ?, ?)", rows)
+        conn.execute("INSERT OR IGNORE INTO indexed_paths VALUES (?)", (prefix,))
+    return len(rows)
+
+def is_indexed(prefix):
+    with closing(open_index()) as conn:
+        return conn.execute("SELECT 1 FROM indexed_paths WHERE prefix = ?", (prefix,)).fetchone() is not None
+
+def query_index(prefix, kinds):
+    query = ("SELECT path FROM backups WHERE substr(path, 1, ?) = ? AND kind IN ({}) ORDER BY ts DESC LIMIT ?"
+             .format(", ".join("?" * len(kinds))))
+    with closing(open_index()) as conn:
+        return [row[0] for row in conn.execute(query, (len(prefix), prefix) + tuple(kinds) + (INDEX_LIMIT,))]
+
+def list_backups(backup_path, kinds=("full", "config")):
+    # Neueste Backups zuerst aus dem Index; wurde dieser Pfad noch nie durchsucht, wird er einmalig aufgebaut
+    prefix = index_prefix(backup_path)
+    if not is_indexed(prefix):
+        rebuild_index(backup_path)
+    paths = query_index(prefix, kinds)
+    existing = [p for p in paths if os.path.exists(p)]
+    if len(existing) != len(paths):
+        # Extern gelöschte Backups aus dem Index entfernen
+        with closing(open_index()) as conn, conn:
+            conn.executemany("DELETE FROM backups WHERE path = ?", [(p,) for p in set(paths) - set(existing)])
+    return [p[len(prefix):] for p in existing]
+
+def get_container_ports(container_name):
+    info = inspect_container(container_name)
+    if info is None:
+        return []
+    ports = []
+    port_bindings = info['HostConfig'].get('PortBindings') or {}
     for container_port, bindings in port_bindings.items():
         if bindings:
             for binding in bindings:
                 host_port = binding.get("HostPort")
                 if host_port:
-                    config['ports'].append((host_port, container_port.split("/")[0]))
+                    ports.append((host_port, container_port.split("/")[0]))
+    return ports
+
+def get_container_config(container_name):
+    info = inspect_container(container_name)
+    if info is None:
+        return None
+    config = {}
+    # Ports
+    config['ports'] = get_container_ports(container_name)
     # Env
     config['env'] = info['Config'].get('Env', [])
     # Labels
@@ -636,147 +1189,143 @@ def get_container_config(container_name):
         config['restart'] = None
     return config
 
+def replace_container_prompt(container_name):
+    # Fragt nach dem zu ersetzenden Container, merkt sich dessen Konfiguration und entfernt ihn
+    running = list_running_containers()
+    run_choices = [{"name": c, "value": c} for c in running] + [{"name": f"Neuen Container '{container_name}' erstellen", "value": None}]
+    target_container = inquirer.select(message="Welcher Container soll ersetzt werden?", choices=run_choices).execute()
+    orig_config = None
+    if target_container:
+        orig_config = get_container_config(target_container)
+        remove_container(target_container)
+    return orig_config
+
+def run_restored_image(container_name, image, orig_config):
+    # Startet das wiederhergestellte Image mit Ports, Env, Labels, Netzwerken und Restart-Policy des alten Containers
+    run_cmd = ["docker", "run", "-d", "--name", container_name]
+    if orig_config:
+        # extend mit Generatoren statt "+=" mit einer neuen Liste pro Argumentpaar
+        run_cmd.extend(arg for host_port, container_port in orig_config['ports'] for arg in ("-p", f"{host_port}:{container_port}"))
+        run_cmd.extend(arg for env in orig_config['env'] for arg in ("-e", env))
+        run_cmd.extend(arg for k, v in orig_config['labels'].items() for arg in ("--label", f"{k}={v}"))
+        run_cmd.extend(arg for net in orig_config['networks'] for arg in ("--network", net))
+        if orig_config['restart']:
+            run_cmd.extend(("--restart", orig_config['restart']))
+    run_cmd.append(image)
+    subprocess.run(run_cmd, check=True)
+    list_running_containers.cache_clear()
+
+def registry_container_name(image):
+    # Originaler Containername aus dem Label des Backups, sonst aus <registry>/<container>:<zeitstempel> (kleingeschrieben)
+    result = subprocess.run(["docker", "image", "inspect", "-f", f'{{{{index .Config.Labels "{CONTAINER_LABEL}"}}}}', image],
+                            capture_output=True, text=True)
+    name = result.stdout.strip()
+    if result.returncode == 0 and name and name != "<no value>":
+        return name
+    return image.rsplit("/", 1)[-1].split(":", 1)[0]
+
+def restore_registry_backup(registry_url):
+    image = inquirer.text(
+        message="Image-Referenz angeben (z.B. registry.example.com/container:2025-04-15_10-00-00):",
+        default=f"{registry_url.rstrip('/')}/"
+    ).execute()
+    if not image or image.endswith("/"):
+        return
+    print(f"Lade Image '{image}'...")
+    subprocess.run(["docker", "pull", "-q", image], check=True, stdout=subprocess.DEVNULL)
+    docker_images.cache_clear()
+    container_name = registry_container_name(image)
+    orig_config = replace_container_prompt(container_name)
+    run_restored_image(container_name, image, orig_config)
+    print(f"Backup aus Registry wiederhergestellt und Container '{container_name}' neu gestartet.")
+    pause()
+
 def restore_backup(config):
     try:
         backup_path = config["backup_path"]
-        # Sammle alle Backups (Voll-Backup .tar und Konfig-Backup _config.tar)
-        all_backups = []
-        for year in os.listdir(backup_path):
-            year_path = os.path.join(backup_path, year)
-            if not os.path.isdir(year_path):
-                continue
-            for month in os.listdir(year_path):
-                month_path = os.path.join(year_path, month)
-                if not os.path.isdir(month_path):
-                    continue
-                for file in os.listdir(month_path):
-                    if file.endswith(".tar"):
-                        all_backups.append(os.path.join(year, month, file))
-        if not all_backups:
+        # Sammle alle Backups (Voll-Backup .tar/.tar.gz und Konfig-Backup _config.tar)
+        all_backups = list_backups(backup_path)
+        if not all_backups and not config.get("registry_url"):
             print("Keine Backups gefunden.")
-            input("[Enter] für Hauptmenü...")
+            pause()
             return
-        choices = [{"name": b, "value": b} for b in all_backups] + [{"name": "Zurück", "value": "Zurück"}]
+        choices = [{"name": b, "value": b} for b in all_backups]
+        if config.get("registry_url"):
+            choices.append({"name": f"Aus Registry wiederherstellen ({config['registry_url']})", "value": "registry"})
+        choices.append({"name": "Zurück", "value": "Zurück"})
         backup_choice = inquirer.select(message="Backup wählen (STRG+C für Hauptmenü):", choices=choices).execute()
         if backup_choice == "Zurück":
             return
+        if backup_choice == "registry":
+            restore_registry_backup(config["registry_url"])
+            return
         full_backup_path = os.path.join(backup_path, backup_choice)
         if full_backup_path.endswith("_config.tar"):
-            import tarfile
-            import json as _json
-            with tempfile.TemporaryDirectory() as tmpdir:
-                with tarfile.open(full_backup_path, "r") as tar:
-                    tar.extractall(tmpdir)
-                config_json_path = os.path.join(tmpdir, "config.json")
-                if not os.path.exists(config_json_path):
-                    print("Fehler: config.json im Archiv nicht gefunden!")
-                    input("[Enter] für Hauptmenü...")
+            # config.json und die Volume-Archive direkt aus dem tar lesen, ohne Entpacken in ein temporäres Verzeichnis
+            info, members = read_config_archive(full_backup_path)
+            if info is None:
+                print("Fehler: config.json im Archiv nicht gefunden!")
+                pause()
+                return
+            image = info.get("image")
+            container_name = info.get("container_name")
+            config_data = info.get("config")
+            volume_archives = info.get("volumes", [])
+            print(f"Stelle Container '{container_name}' mit Image '{image}' wieder her...")
+            # Prüfe, ob das Image lokal existiert (Docker filtert selbst, statt die komplette Image-Liste zu liefern)
+            local_images_set = set(docker_images(image.strip()))
+            # Ohne Tag speichert Docker das Image als ":latest"
+            if image.strip() not in local_images_set and f"{image.strip()}:latest" not in local_images_set:
+                print(f"Image '{image}' nicht lokal gefunden. Versuche, es aus dem Internet zu laden...")
+                pull_result = subprocess.run(["docker", "pull", "-q", image], stdout=subprocess.DEVNULL)
+                docker_images.cache_clear()
+                if pull_result.returncode != 0:
+                    print(f"Fehler: Image '{image}' konnte nicht geladen werden. Bitte prüfe, ob das Image öffentlich verfügbar ist oder führe ein Voll-Backup/Restore durch.")
+                    pause()
                     return
-                with open(config_json_path, "r") as f:
-                    info = _json.load(f)
-                image = info.get("image")
-                container_name = info.get("container_name")
-                config_data = info.get("config")
-                volume_archives = info.get("volumes", [])
-                print(f"Stelle Container '{container_name}' mit Image '{image}' wieder her...")
-                # Prüfe, ob das Image lokal existiert
-                local_images = subprocess.run(["docker", "images", "--format", "{{.Repository}}:{{.Tag}}"], capture_output=True, text=True)
-                local_images_list = local_images.stdout.splitlines()
-                if image not in local_images_list:
-                    print(f"Image '{image}' nicht lokal gefunden. Versuche, es aus dem Internet zu laden...")
-                    pull_result = subprocess.run(["docker", "pull", image])
-                    if pull_result.returncode != 0:
-                        print(f"Fehler: Image '{image}' konnte nicht geladen werden. Bitte prüfe, ob das Image öffentlich verfügbar ist oder führe ein Voll-Backup/Restore durch.")
-                        input("[Enter] für Hauptmenü...")
-                        return
-                # Auswahl: existierenden Container ersetzen oder neuen erstellen
-                running = list_running_containers()
-                choices = [{"name": c, "value": c} for c in running] + [{"name": f"Neuen Container '{container_name}' erstellen", "value": None}]
-                target_container = inquirer.select(message="Welcher Container soll ersetzt werden?", choices=choices).execute()
-                if target_container:
-                    subprocess.run(["docker", "rm", "-f", target_container], check=False)
-                # Volumes wiederherstellen
-                for vol_tar in volume_archives:
-                    vol_name = vol_tar.replace(".tar.gz", "")
-                    subprocess.run(["docker", "volume", "create", vol_name], check=False)
-                    vol_tar_path = os.path.join(tmpdir, vol_tar)
-                    if os.path.exists(vol_tar_path):
-                        subprocess.run([
-                            "docker", "run", "--rm", "-v", f"{vol_name}:/data", "-v", f"{tmpdir}:/backup", "alpine",
-                            "sh", "-c", f"tar xzf /backup/{vol_tar} -C /data"
-                        ], check=True)
-                        print(f"Volume {vol_name} wiederhergestellt aus {vol_tar}.")
-                    else:
-                        print(f"Warnung: Volume-Archiv {vol_tar} nicht gefunden, Volume bleibt leer!")
-                # Container starten wie gehabt
-                run_cmd = ["docker", "run", "-d", "--name", container_name]
-                port_bindings = config_data['HostConfig'].get('PortBindings', {})
-                for container_port, bindings in port_bindings.items():
-                    if bindings:
-                        for binding in bindings:
-                            host_port = binding.get("HostPort")
-                            if host_port:
-                                run_cmd += ["-p", f"{host_port}:{container_port.split('/')[0]}"]
-                for env in config_data['Config'].get('Env', []):
-                    run_cmd += ["-e", env]
-                for k, v in config_data['Config'].get('Labels', {}).items():
-                    run_cmd += ["--label", f"{k}={v}"]
-                networks = list(config_data['NetworkSettings']['Networks'].keys())
-                for net in networks:
-                    run_cmd += ["--network", net]
-                restart = config_data['HostConfig'].get('RestartPolicy', {})
-                if restart.get('Name'):
-                    run_cmd += ["--restart", restart['Name']]
-                for v in config_data['Mounts']:
-                    if v['Type'] == 'volume':
-                        run_cmd += ["-v", f"{v['Name']}:{v['Destination']}"]
-                run_cmd.append(image)
-                subprocess.run(run_cmd, check=True)
-                print(f"Container '{container_name}' wurde aus Konfigurations-Backup wiederhergestellt.")
-                print("\nINFO: Einstellungen, Image und Volumes wurden wiederhergestellt. Daten, die nicht in Volumes lagen, sind verloren!")
-                input("[Enter] für Hauptmenü...")
-        elif full_backup_path.endswith(".tar"):
+            # Auswahl: existierenden Container ersetzen oder neuen erstellen
+            running = list_running_containers()
+            choices = [{"name": c, "value": c} for c in running] + [{"name": f"Neuen Container '{container_name}' erstellen", "value": None}]
+            target_container = inquirer.select(message="Welcher Container soll ersetzt werden?", choices=choices).execute()
+            if target_container:
+                remove_container(target_container)
+            # Volumes wiederherstellen
+            jobs = [(vol_tar.replace(".tar.gz", ""), vol_tar) for vol_tar in volume_archives]
+            if not restore_volumes(jobs, full_backup_path, members, config.get("use_host_tar", False)):
+                print(f"Container '{container_name}' wird nicht gestartet, damit er nicht mit unvollständigen Volumes läuft.")
+                pause()
+                return
+            # Container starten wie gehabt
+            run_cmd = config_run_cmd(container_name, image, config_data)
+            subprocess.run(run_cmd, check=True)
+            list_running_containers.cache_clear()
+            print(f"Container '{container_name}' wurde aus Konfigurations-Backup wiederhergestellt.")
+            print("\nINFO: Einstellungen, Image und Volumes wurden wiederhergestellt. Daten, die nicht in Volumes lagen, sind verloren!")
+            pause()
+        elif full_backup_path.endswith((".tar", ".tar.gz")):
             # Voll-Backup (Image)
-            filename = os.path.basename(full_backup_path)
-            try:
-                _, container_name = filename.split("_", 1)
-                container_name = container_name.rsplit(".tar", 1)[0].split("_", 1)[1]
-            except Exception:
+            match = BACKUP_FN_RE.match(os.path.basename(full_backup_path))
+            if not match:
                 print("Konnte Containernamen nicht aus Dateiname extrahieren.")
-                input("[Enter] für Hauptmenü...")
+                pause()
                 return
-            running = list_running_containers()
-            run_choices = [{"name": c, "value": c} for c in running] + [{"name": f"Neuen Container '{container_name}' erstellen", "value": None}]
-            target_container = inquirer.select(message="Welcher Container soll ersetzt werden?", choices=run_choices).execute()
-            orig_config = None
-            if target_container:
-                orig_config = get_container_config(target_container)
-                subprocess.run(["docker", "rm", "-f", target_container], check=False)
-            subprocess.run(["docker", "volume", "prune", "-f"], check=False)
-            subprocess.run(["docker", "load", "-i", full_backup_path], check=True)
-            result = subprocess.run(["docker", "image", "ls", "--format", "{{.Repository}}:{{.Tag}}"], capture_output=True, text=True)
-            images = [img for img in result.stdout.splitlines() if container_name in img]
+            container_name = match.group(1)
+            orig_config = replace_container_prompt(container_name)
+            print("Lade Image aus dem Backup...")
+            load = subprocess.run(["docker", "load", "-q", "-i", full_backup_path], check=True, stdout=subprocess.PIPE, text=True)
+            docker_images.cache_clear()
+            # "docker load" nennt das geladene Image selbst; sonst filtert Docker die Image-Liste nach dem Containernamen
+            # (Containernamen enthalten keine Glob-Zeichen, daher ohne Escaping)
+            images = [line.split(":", 1)[1].strip() for line in load.stdout.splitlines() if line.startswith("Loaded image:")]
+            if not images:
+                images = docker_images(f"*{container_name}*")
             if not images:
                 print("Kein passendes Image gefunden.")
-                input("[Enter] für Hauptmenü...")
+                pause()
                 return
-            image = images[0]
-            run_cmd = ["docker", "run", "-d", "--name", container_name]
-            if orig_config:
-                for host_port, container_port in orig_config['ports']:
-                    run_cmd += ["-p", f"{host_port}:{container_port}"]
-                for env in orig_config['env']:
-                    run_cmd += ["-e", env]
-                for k, v in orig_config['labels'].items():
-                    run_cmd += ["--label", f"{k}={v}"]
-                for net in orig_config['networks']:
-                    run_cmd += ["--network", net]
-                if orig_config['restart']:
-                    run_cmd += ["--restart", orig_config['restart']]
-            run_cmd.append(image)
-            subprocess.run(run_cmd, check=True)
+            run_restored_image(container_name, images[0], orig_config)
             print(f"Backup wiederhergestellt und Container '{container_name}' neu gestartet.")
-            input("[Enter] für Hauptmenü...")
+            pause()
     except KeyboardInterrupt:
         print("\nZurück zum Hauptmenü...")
     except Exception as e:
@@ -784,6 +1333,23 @@ def restore_backup(config):
     return
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Docker Backup Tool")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="Backup-Ordner einmal komplett durchsuchen und den Backup-Index neu aufbauen")
+    parser.add_argument("--serial-restore", action="store_true",
+                        help="Volumes beim Wiederherstellen nacheinander statt parallel entpacken")
+    parser.add_argument("--non-interactive", action="store_true",
+                        help="Nicht auf [Enter] warten (für Skripte und Automatisierung)")
+    args = parser.parse_args()
+    global SERIAL_RESTORE, NON_INTERACTIVE
+    SERIAL_RESTORE = args.serial_restore
+    NON_INTERACTIVE = args.non_interactive
+    if args.rebuild_index:
+        config = load_config()
+        count = rebuild_index(config["backup_path"])
+        print(f"Backup-Index neu aufgebaut: {count} Backups gefunden.")
+        return
     print("=== Docker Backup Tool ===")
     check_docker()
     config = load_config()